@@ -1,44 +1,291 @@
+import pickle
 import shelve
+import threading
+import weakref
+from collections import OrderedDict
+
+_MISSING = object()
+
+class _GroupCommitShelf:
+    def __init__(self, db_name, flush_interval, cache_size):
+        """Open the shelve and start the background flusher thread."""
+        self.db_name = db_name
+        self._protocol = pickle.HIGHEST_PROTOCOL
+        self.db = shelve.open(db_name, protocol=self._protocol)
+        self.flush_interval = flush_interval
+        self._write_buf = {}
+        self._dirty_deletes = set()
+        self._flushing_writes = {}
+        self._flushing_deletes = set()
+        self._cache = OrderedDict()
+        self.cache_size = cache_size
+        self._cond = threading.Condition()
+        self._io_lock = threading.RLock()  # Guards self.db; always taken before _cond
+        self._closed = False
+        self._flush_error = None
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    def _pending(self):
+        """Return True if there are buffered writes or deletes."""
+        return bool(self._write_buf or self._dirty_deletes)
+
+    def _check_open(self):
+        """Raise if the store is closed or the flusher has died. Caller holds the lock."""
+        if self._closed:
+            raise ValueError(f"KVStore {self.db_name} is closed")
+        if self._flush_error is not None:
+            raise RuntimeError(f"Background flush of {self.db_name} failed") from self._flush_error
+
+    def _flush(self):
+        """Apply buffered mutations to the shelve and sync once.
+
+        The buffers are swapped out under the lock and written under the
+        I/O lock only, so readers and writers are not blocked by the sync.
+        """
+        with self._io_lock:
+            with self._cond:
+                if not self._pending():
+                    return
+                writes, deletes = self._write_buf, self._dirty_deletes
+                self._write_buf, self._dirty_deletes = {}, set()
+                self._flushing_writes, self._flushing_deletes = writes, deletes
+            try:
+                # Values are pickled when buffered, so write the bytes straight to the
+                # underlying dbm handle instead of going through Shelf.__setitem__.
+                raw = self.db.dict
+                encoding = self.db.keyencoding
+                for key in deletes:
+                    raw_key = key.encode(encoding)
+                    if raw_key in raw:
+                        del raw[raw_key]
+                for key, data in writes.items():
+                    raw[key.encode(encoding)] = data
+                self.db.sync()
+            except BaseException:
+                with self._cond:
+                    # Requeue the batch under anything buffered since, so a later flush retries it
+                    for key in deletes:
+                        if key not in self._write_buf:
+                            self._dirty_deletes.add(key)
+                    for key, data in writes.items():
+                        if key not in self._write_buf and key not in self._dirty_deletes:
+                            self._write_buf[key] = data
+                raise
+            finally:
+                with self._cond:
+                    self._flushing_writes, self._flushing_deletes = {}, set()
+
+    def _flush_loop(self):
+        """Background flusher: wait for writes, let them coalesce, then flush."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or self._pending())
+                if self._closed:
+                    return
+                self._cond.wait(self.flush_interval)
+            try:
+                self._flush()
+            except Exception as exc:
+                with self._cond:
+                    self._flush_error = exc
+                return
+
+    def flush(self):
+        """Write all buffered mutations to disk now."""
+        self._flush()
+
+    def _lookup(self, key):
+        """Resolve key from the buffers or cache without touching disk. Caller holds the lock.
+
+        Returns (found, value); value is _MISSING for a buffered delete.
+        """
+        for writes, deletes in ((self._write_buf, self._dirty_deletes),
+                                (self._flushing_writes, self._flushing_deletes)):
+            if key in writes:
+                return True, pickle.loads(writes[key])
+            if key in deletes:
+                return True, _MISSING
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return True, pickle.loads(self._cache[key])
+        return False, None
+
+    def get(self, key, default=None):
+        """Get a value by key, or default if the key is missing."""
+        with self._cond:
+            found, value = self._lookup(key)
+        if not found:
+            # Holding both locks, no flush or buffered write can land between
+            # the re-check and the disk read.
+            with self._io_lock, self._cond:
+                found, value = self._lookup(key)
+                if not found:
+                    raw = self.db.dict
+                    raw_key = key.encode(self.db.keyencoding)
+                    if raw_key in raw:
+                        data = raw[raw_key]
+                        self._cache[key] = data
+                        if len(self._cache) > self.cache_size:
+                            self._cache.popitem(last=False)
+                        value = pickle.loads(data)
+                    else:
+                        value = _MISSING
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, default=None):
+        """Get the values for several keys, in order, with default for misses."""
+        return [self.get(key, default) for key in keys]
+
+    def set(self, key, value):
+        """Set a value by key."""
+        # Pickle now so unpicklable values fail here, not in the flusher, and
+        # later mutations of value do not change what gets written.
+        data = pickle.dumps(value, self._protocol)
+        with self._cond:
+            self._check_open()
+            if not self._pending():
+                self._cond.notify()
+            self._write_buf[key] = data
+            self._dirty_deletes.discard(key)
+            self._cache.pop(key, None)
+
+    def set_many(self, items):
+        """Set several key-value pairs, syncing once for the whole batch."""
+        protocol = self._protocol
+        items = {key: pickle.dumps(value, protocol) for key, value in dict(items).items()}
+        with self._cond:
+            self._check_open()
+            if not self._pending():
+                self._cond.notify()
+            self._write_buf.update(items)
+            self._dirty_deletes.difference_update(items)
+            for key in items:
+                self._cache.pop(key, None)
+
+    def keys(self):
+        """Return all keys."""
+        with self._io_lock:
+            self._flush()
+            return list(self.db.keys())
+
+    def values(self):
+        """Return all values."""
+        with self._io_lock:
+            self._flush()
+            return list(self.db.values())
+
+    def items(self):
+        """Return all key-value pairs."""
+        with self._io_lock:
+            self._flush()
+            return list(self.db.items())
+
+    def clear(self):
+        """Erase everything from the database."""
+        with self._io_lock, self._cond:
+            self._write_buf.clear()
+            self._dirty_deletes.clear()
+            self._cache.clear()
+            self.db.clear()
+            self.db.sync()
+
+
+    def delete(self, key):
+        """Delete a key-value pair by key."""
+        with self._cond:
+            self._check_open()
+            if not self._pending():
+                self._cond.notify()
+            self._write_buf.pop(key, None)
+            self._dirty_deletes.add(key)
+            self._cache.pop(key, None)
+
+    def delete_many(self, keys):
+        """Delete several keys, syncing once for the whole batch."""
+        with self._cond:
+            self._check_open()
+            if not self._pending():
+                self._cond.notify()
+            for key in keys:
+                self._write_buf.pop(key, None)
+                self._dirty_deletes.add(key)
+                self._cache.pop(key, None)
+
+    def close(self):
+        """Flush pending writes, stop the flusher and close the database."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+        try:
+            self._flush()
+        finally:
+            self.db.close()
 
 class KVStore:
-    def __init__(self, db_name):
-        """Constructor for the KVStore class."""
+    def __init__(self, db_name, flush_interval=0.005, cache_size=1024):
+        """Constructor for the KVStore class.
+
+        Writes are buffered and applied by a background flusher thread,
+        which waits flush_interval seconds to coalesce them into a single
+        sync() (group commit). The pickled bytes of up to cache_size recently
+        read values are kept in an LRU cache so hot reads skip the dbm
+        lookup; every hit still unpickles a fresh copy for the caller.
+        """
         self.db_name = db_name
-        self.db = shelve.open(db_name)
-    
-    def get(self, key):
-        """Get a value by key."""
-        return self.db.get(key, f"Key {key} not found in {self.db_name}")
+        self._shelf = _GroupCommitShelf(db_name, flush_interval, cache_size)
+        # The flusher thread only references the inner shelf, so a KVStore that is
+        # dropped without close() can still be collected. The finalizer then flushes
+        # and closes the shelf, as it does at interpreter exit for stores still open.
+        self._finalizer = weakref.finalize(self, self._shelf.close)
+
+    def flush(self):
+        """Write all buffered mutations to disk now."""
+        self._shelf.flush()
+
+    def get(self, key, default=None):
+        """Get a value by key, or default if the key is missing."""
+        return self._shelf.get(key, default)
+
+    def get_many(self, keys, default=None):
+        """Get the values for several keys, in order, with default for misses."""
+        return self._shelf.get_many(keys, default)
 
     def set(self, key, value):
         """Set a value by key."""
-        self.db[key] = value
-        self.db.sync()
-        
+        self._shelf.set(key, value)
+
+    def set_many(self, items):
+        """Set several key-value pairs, syncing once for the whole batch."""
+        self._shelf.set_many(items)
+
     def keys(self):
         """Return all keys."""
-        return list(self.db.keys())
-    
+        return self._shelf.keys()
+
     def values(self):
         """Return all values."""
-        return list(self.db.values())
+        return self._shelf.values()
 
     def items(self):
         """Return all key-value pairs."""
-        return list(self.db.items())
-    
+        return self._shelf.items()
+
     def clear(self):
         """Erase everything from the database."""
-        self.db.clear()
-        self.db.sync() 
-        
+        self._shelf.clear()
 
     def delete(self, key):
         """Delete a key-value pair by key."""
-        if key in self.db:
-            del self.db[key]
-            self.db.sync()
+        self._shelf.delete(key)
+
+    def delete_many(self, keys):
+        """Delete several keys, syncing once for the whole batch."""
+        self._shelf.delete_many(keys)
 
     def close(self):
-        """Close the database."""
-        self.db.close()
+        """Flush pending writes, stop the flusher and close the database."""
+        self._finalizer()
@@ -1,10 +1,79 @@
 import json
-import uuid
+import math
+import sys
 from kv_store import KVStore
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_JSON_SCALARS = frozenset((str, int, bool, type(None)))
+_JSON_KEY_TYPES = (str, int, float, type(None))  # bool is an int
+
+def _needs_stdlib_json(obj):
+    """Return True if obj holds a NaN or infinite float, which orjson would write as null.
+
+    Raise TypeError, as json.dumps does, for values and keys stdlib json cannot
+    encode but orjson would (UUIDs, plain enums, datetimes, dataclasses).
+    """
+    stack, seen = [obj], set()
+    while stack:
+        value = stack.pop()
+        if type(value) in _JSON_SCALARS:
+            continue
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, (str, int)):
+            continue
+        elif isinstance(value, dict):
+            if id(value) in seen:  # Skip repeats so circular data terminates
+                continue
+            seen.add(id(value))
+            for key in value:
+                if not isinstance(key, _JSON_KEY_TYPES):
+                    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+                if isinstance(key, float) and not math.isfinite(key):
+                    return True
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            if id(value) not in seen:
+                seen.add(id(value))
+                stack.extend(value)
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return False
+
+# orjson payloads are stored as bytes. Rows orjson cannot round-trip exactly
+# are encoded by the stdlib json module and stored as str, so _loads can pick
+# the decoder that matches, and the same rows are accepted with or without orjson.
+if orjson is not None:
+    def _dumps(obj):
+        if _needs_stdlib_json(obj):  # orjson would write NaN/Infinity as null; json keeps them
+            return json.dumps(obj)
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # e.g. integers wider than 64 bits
+            return json.dumps(obj)
+
+    def _loads(data):
+        if isinstance(data, str):
+            return json.loads(data)
+        return orjson.loads(data)
+else:
+    _dumps = json.dumps
+    _loads = json.loads
+
 class Row:
-    def __init__(self, **columns):
-        """Initialize a row with given columns."""
+    __slots__ = ('columns',)
+
+    def __init__(self, columns=None, /, **kwargs):
+        """Initialize a row from a columns dict or from keyword columns, not both."""
+        if columns is None:
+            columns = kwargs
+        elif kwargs:
+            raise TypeError("Row() takes a columns dict or keyword columns, not both")
         self.columns = columns
 
 class Table:
@@ -12,42 +81,90 @@ class Table:
         """Initialize a table with a name and KV store."""
         self.name = name
         self.kv_store = kv_store
+        self._prefix = sys.intern(name + ":")
+        prefix, prefix_len = self._prefix, len(self._prefix)
+        self._row_keys = {key[prefix_len:] for key in kv_store.keys() if key.startswith(prefix)}
+        # No ":" after the namespace, so no table's "<name>:" row prefix can match it
+        self._seq_key = f"__seq__/{name}"
+        self._next_id = kv_store.get(self._seq_key, 0)
 
     def insert(self, row):
         """Insert a row into the table."""
-        key = str(uuid.uuid4())  # Generate a unique key for the row
-        self.kv_store.set(f"{self.name}:{key}", json.dumps(row.columns))
-        return key
+        return self.insert_many([row])[0]
+
+    def insert_many(self, rows):
+        """Insert several rows in one batch and return their keys."""
+        rows = list(rows)
+        if not rows:
+            return []
+        next_id = self._next_id + len(rows)
+        # Monotonic per-table keys, sorting in insert order
+        keys = [f"{i:016x}" for i in range(self._next_id, next_id)]
+        prefix = self._prefix
+        items = {prefix + key: _dumps(row.columns) for key, row in zip(keys, rows)}
+        # Persist the counter in the same batch so a reopened table never reuses a key
+        items[self._seq_key] = next_id
+        self.kv_store.set_many(items)
+        # Advance only once every row has encoded, so a bad row burns no ids
+        self._next_id = next_id
+        self._row_keys.update(keys)
+        return keys
 
     def query(self, key):
         """Query a row by key."""
-        data = self.kv_store.get(f"{self.name}:{key}")
-        if data.startswith("Key "):  # Handle case where key is not found
+        data = self.kv_store.get(self._prefix + key)
+        if data is None:  # Handle case where key is not found
             return None
-        return Row(**json.loads(data))
+        return Row(_loads(data))
 
     def delete(self, key):
         """Delete a row by key."""
-        self.kv_store.delete(f"{self.name}:{key}")
+        self.kv_store.delete(self._prefix + key)
+        self._row_keys.discard(key)
+
+    def _scan(self):
+        """Return the stored payloads of all rows, forgetting keys that are gone from the store."""
+        keys = list(self._row_keys)
+        prefix = self._prefix
+        payloads = []
+        for key, data in zip(keys, self.kv_store.get_many([prefix + key for key in keys])):
+            if data is None:  # Deleted or cleared behind this Table's back
+                self._row_keys.discard(key)
+            else:
+                payloads.append(data)
+        return payloads
 
     def list_rows(self):
         """List all rows in the table."""
         rows = []
-        prefix = f"{self.name}:"
-        for key in self.kv_store.keys():
-            if key.startswith(prefix):
-                data = self.kv_store.get(key)
-                if not data.startswith("Key "):
-                    rows.append(Row(**json.loads(data)))
+        for data in self._scan():
+            rows.append(Row(_loads(data)))
         return rows
 
+    def scan_columns(self, fields):
+        """Return a dict mapping each requested field to a list of its values across all rows."""
+        columns = {field: [] for field in fields}
+        for data in self._scan():
+            values = _loads(data)
+            for field, column in columns.items():
+                column.append(values.get(field))
+        return columns
+
     def update(self, key, **updates):
         """Update a row by key."""
-        row = self.query(key)
-        if row:
-            row.columns.update(updates)
-            self.kv_store.set(f"{self.name}:{key}", json.dumps(row.columns))
+        full_key = self._prefix + key
+        data = self.kv_store.get(full_key)
+        if data is not None:
+            columns = _loads(data)
+            columns.update(updates)
+            self.kv_store.set(full_key, _dumps(columns))
 
     def count_rows(self):
-        """Count the number of rows in the table."""
-        return len(self.list_rows())
+        """Count the number of rows in the table.
+
+        The count comes from the in-memory key set, so it is only exact while
+        this Table is the sole writer of its rows. Rows removed directly through
+        the KV store (e.g. kv_store.clear()) are dropped on the next list_rows
+        or scan_columns.
+        """
+        return len(self._row_keys)
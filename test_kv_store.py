@@ -0,0 +1,136 @@
+import gc
+import os
+import tempfile
+import threading
+import unittest
+import weakref
+
+from kv_store import KVStore
+
+class KVStoreTest(unittest.TestCase):
+    def setUp(self):
+        """Open a store in a fresh temporary directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "test.db")
+        self.store = KVStore(self.path)
+
+    def tearDown(self):
+        """Close the store and remove its files."""
+        self.store.close()
+        self.tmp.cleanup()
+
+    def reopen(self, **kwargs):
+        """Close the store and open it again from disk."""
+        self.store.close()
+        self.store = KVStore(self.path, **kwargs)
+
+    def test_reads_see_buffered_writes(self):
+        self.reopen(flush_interval=60)  # Keep writes in the buffer
+        self.store.set("a", 1)
+        self.store.set_many({"b": 2, "c": 3})
+        self.store.delete("c")
+        self.assertEqual(self.store.get("a"), 1)
+        self.assertEqual(self.store.get_many(["a", "b", "c"]), [1, 2, None])
+        self.assertEqual(self.store.get("c", "missing"), "missing")
+
+    def test_close_persists_pending_writes(self):
+        self.reopen(flush_interval=60)
+        self.store.set_many({f"k{i}": i for i in range(100)})
+        self.reopen()
+        self.assertEqual(len(self.store.keys()), 100)
+        self.assertEqual(self.store.get("k42"), 42)
+
+    def test_dropped_store_is_collected_and_flushed(self):
+        self.reopen(flush_interval=60)
+        self.store.set("a", 1)
+        ref = weakref.ref(self.store)
+        self.store = None
+        gc.collect()
+        self.assertIsNone(ref())
+        self.store = KVStore(self.path)
+        self.assertEqual(self.store.get("a"), 1)
+
+    def test_delete_survives_reopen(self):
+        self.store.set("a", 1)
+        self.store.set("b", 2)
+        self.store.flush()
+        self.store.delete("a")
+        self.store.delete_many(["b", "never-set"])
+        self.reopen()
+        self.assertIsNone(self.store.get("a"))
+        self.assertIsNone(self.store.get("b"))
+        self.assertEqual(self.store.keys(), [])
+
+    def test_unpicklable_value_raises_in_caller(self):
+        with self.assertRaises(TypeError):
+            self.store.set("lock", threading.Lock())
+        with self.assertRaises(TypeError):
+            self.store.set_many({"ok": 1, "lock": threading.Lock()})
+        self.store.set("a", 1)
+        self.reopen()
+        self.assertEqual(self.store.keys(), ["a"])
+
+    def test_buffered_value_is_a_snapshot(self):
+        value = [1]
+        self.store.set("k", value)
+        value.append(2)
+        self.reopen()
+        self.assertEqual(self.store.get("k"), [1])
+
+    def test_cache_is_invalidated_on_write(self):
+        self.store.set("k", "old")
+        self.store.flush()
+        self.assertEqual(self.store.get("k"), "old")  # Now cached
+        self.store.set("k", "new")
+        self.store.flush()
+        self.assertEqual(self.store.get("k"), "new")
+        self.store.delete("k")
+        self.store.flush()
+        self.assertIsNone(self.store.get("k"))
+
+    def test_cached_values_are_not_shared(self):
+        self.store.set("k", [1])
+        self.store.flush()
+        self.store.get("k").append(99)
+        self.assertEqual(self.store.get("k"), [1])
+
+    def test_failed_flush_is_requeued_and_reported(self):
+        shelf = self.store._shelf
+        sync = shelf.db.sync
+        calls = []
+
+        def failing_sync():
+            calls.append(1)
+            if len(calls) == 1:
+                self.store.set("a", "newer")  # Buffered while the batch is in flight
+                raise OSError("disk full")
+            sync()
+
+        shelf.db.sync = failing_sync
+        self.store.set_many({"a": "old", "b": "kept"})
+        shelf._flusher.join(timeout=5)
+        self.assertFalse(shelf._flusher.is_alive())
+        # The failed batch is back in the buffer, under the newer write
+        self.assertEqual(self.store.get("a"), "newer")
+        self.assertEqual(self.store.get("b"), "kept")
+        with self.assertRaises(RuntimeError) as ctx:
+            self.store.set("c", 1)
+        self.assertIsInstance(ctx.exception.__cause__, OSError)
+        self.store.close()
+        with self.assertRaises(ValueError):  # The shelf itself is closed
+            shelf.db["a"]
+        self.reopen()
+        self.assertEqual(self.store.get("a"), "newer")
+        self.assertEqual(self.store.get("b"), "kept")
+        self.assertIsNone(self.store.get("c"))
+
+    def test_writes_after_close_raise(self):
+        self.store.close()
+        with self.assertRaises(ValueError):
+            self.store.set("a", 1)
+        with self.assertRaises(ValueError):
+            self.store.delete("a")
+        self.store = KVStore(self.path)
+
+if __name__ == "__main__":
+    unittest.main()
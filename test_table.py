@@ -0,0 +1,125 @@
+import math
+import os
+import tempfile
+import unittest
+import uuid
+
+import table
+from kv_store import KVStore
+from table import Row, Table
+
+class TableTest(unittest.TestCase):
+    def setUp(self):
+        """Open a store in a fresh temporary directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "test.db")
+        self.store = KVStore(self.path)
+
+    def tearDown(self):
+        """Close the store and remove its files."""
+        self.store.close()
+        self.tmp.cleanup()
+
+    def reopen(self):
+        """Close the store and open it again from disk."""
+        self.store.close()
+        self.store = KVStore(self.path)
+
+    def test_insert_many_keys_are_sequential(self):
+        users = Table("users", self.store)
+        keys = users.insert_many([Row(n=1), Row(n=2), Row(n=3)])
+        self.assertEqual(keys, ["0000000000000000", "0000000000000001", "0000000000000002"])
+        self.assertEqual(users.insert(Row(n=4)), "0000000000000003")
+        self.assertEqual(users.query(keys[1]).columns, {"n": 2})
+
+    def test_counter_survives_reopen(self):
+        users = Table("users", self.store)
+        first = users.insert_many([Row(n=1), Row(n=2)])
+        users.delete(first[-1])  # The highest key must not be handed out again
+        self.reopen()
+        users = Table("users", self.store)
+        key = users.insert(Row(n=3))
+        self.assertNotIn(key, first)
+        self.assertGreater(key, first[-1])
+        self.assertEqual(users.count_rows(), 2)
+
+    def test_seq_named_table_ignores_counters(self):
+        Table("users", self.store).insert(Row(n=1))
+        Table("orders", self.store).insert(Row(n=2))
+        seq = Table("__seq__", self.store)
+        self.assertEqual(seq.count_rows(), 0)
+        self.assertEqual(seq.list_rows(), [])
+        seq.insert(Row(n=3))
+        self.assertEqual([row.columns for row in seq.list_rows()], [{"n": 3}])
+
+    def test_payloads_round_trip(self):
+        users = Table("users", self.store)
+        wide = users.insert(Row(n=2**70))
+        nan = users.insert(Row(x=float("nan"), y=float("inf")))
+        null = users.insert(Row(note=None, tag="nullable"))
+        self.reopen()
+        users = Table("users", self.store)
+        self.assertEqual(users.query(wide).columns, {"n": 2**70})
+        columns = users.query(nan).columns
+        self.assertTrue(math.isnan(columns["x"]))
+        self.assertEqual(columns["y"], float("inf"))
+        self.assertEqual(users.query(null).columns, {"note": None, "tag": "nullable"})
+
+    def test_payload_types(self):
+        # With orjson, only rows it cannot encode exactly are stored as json text
+        expected = bytes if table.orjson is not None else str
+        self.assertIsInstance(table._dumps({"note": None}), expected)
+        self.assertIsInstance(table._dumps({"n": 2**70}), str)
+        self.assertIsInstance(table._dumps({"x": float("nan")}), str)
+        self.assertEqual(table._loads(table._dumps({1: "x"})), {"1": "x"})
+
+    def test_rejects_what_json_rejects(self):
+        for columns in ({"id": uuid.uuid4()}, {"s": {1, 2}}, {(1, 2): "x"}):
+            with self.assertRaises(TypeError):
+                table._dumps(columns)
+
+    def test_insert_many_edge_cases(self):
+        users = Table("users", self.store)
+        self.assertEqual(users.insert_many([]), [])
+        self.assertIsNone(self.store.get("__seq__/users"))
+        with self.assertRaises(TypeError):
+            users.insert_many([Row(n=1), Row(id=uuid.uuid4())])
+        self.assertEqual(users.count_rows(), 0)
+        self.assertEqual(users.insert(Row(n=1)), "0000000000000000")  # No ids were burned
+
+    def test_update_delete_and_count(self):
+        users = Table("users", self.store)
+        alice, bob = users.insert_many([Row(name="Alice", age=30), Row(name="Bob", age=25)])
+        users.update(alice, age=31)
+        users.update("missing", age=1)
+        self.assertEqual(users.query(alice).columns, {"name": "Alice", "age": 31})
+        users.delete(bob)
+        self.assertIsNone(users.query(bob))
+        self.assertEqual(users.count_rows(), 1)
+        self.assertEqual([row.columns for row in users.list_rows()], [{"name": "Alice", "age": 31}])
+
+    def test_count_matches_list_after_clear(self):
+        users = Table("users", self.store)
+        users.insert_many([Row(n=1), Row(n=2)])
+        self.store.clear()
+        self.assertEqual(users.list_rows(), [])
+        self.assertEqual(users.count_rows(), 0)
+
+    def test_scan_columns_stays_aligned(self):
+        users = Table("users", self.store)
+        users.insert_many([Row(name="Alice", age=30), Row(name="Bob"), Row(age=40)])
+        columns = users.scan_columns(["name", "age"])
+        self.assertEqual(len(columns["name"]), 3)
+        self.assertEqual(
+            sorted(zip(columns["name"], columns["age"]), key=repr),
+            sorted([("Alice", 30), ("Bob", None), (None, 40)], key=repr),
+        )
+
+    def test_row_rejects_dict_and_keywords(self):
+        self.assertEqual(Row({"x": 1}).columns, {"x": 1})
+        self.assertEqual(Row(columns=1).columns, {"columns": 1})
+        with self.assertRaises(TypeError):
+            Row({"x": 1}, y=2)
+
+if __name__ == "__main__":
+    unittest.main()